@@ -1,11 +1,27 @@
 # bot.py
 import os
-import json
+import re
+import sys
+import time
+import heapq
+import base64
+import orjson
 import asyncio
+import signal
 import logging
+from collections import defaultdict
+from io import BytesIO
 from typing import Optional
-from aiohttp import ClientSession, ClientTimeout
-from bs4 import BeautifulSoup
+import httpx
+from pybloom_live import BloomFilter
+
+try:
+    # libuv-based event loop: noticeably faster scraping + polling throughput;
+    # not available on Windows, where the default loop is used instead
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -20,7 +36,14 @@ from telegram.ext import (
 # ---------- Config ----------
 DATA_FILE = "data.json"
 MAX_ACCOUNTS = 5
-POLL_INTERVAL_SECONDS = 30  # adjust (30-60 recommended)
+POLL_INTERVAL_SECONDS = 30  # minimum gap between polls of one username (30-60 recommended)
+POLL_INTERVAL_MAX_SECONDS = int(os.getenv("POLL_INTERVAL_MAX_SECONDS", "600"))  # cap for idle accounts
+POLL_EWMA_ALPHA = 0.3  # weight of the newest observed tweet gap in the interval estimate
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "10"))  # parallel fetches per tick (10-20 recommended)
+FLUSH_INTERVAL_SECONDS = 5  # how often the dirty in-memory DB is flushed to disk
+# Nitter mirror serving per-user RSS feeds: a few KB of XML per poll instead of
+# the ~500KB x.com HTML blob. Overridable when the default mirror is down.
+NITTER_BASE = os.getenv("NITTER_BASE", "https://nitter.net").rstrip("/")
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 " \
              "(KHTML, like Gecko) Chrome/119.0 Safari/537.36"
 
@@ -33,149 +56,455 @@ def load_data():
     if not os.path.exists(DATA_FILE):
         return {}
     try:
-        with open(DATA_FILE, "r") as f:
-            return json.load(f)
+        with open(DATA_FILE, "rb") as f:
+            return orjson.loads(f.read())
     except Exception:
         logger.exception("Failed to load data.json, returning empty DB.")
         return {}
 
 def save_data(data):
     try:
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+        # atomic replace so a crash mid-write never leaves a truncated DB
+        tmp = DATA_FILE + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp, DATA_FILE)
     except Exception:
         logger.exception("Failed to save data.json")
 
+# In-memory DB is the single source of truth; handlers and the tracker mutate
+# DATA directly and set the dirty flag, and the flusher coalesces writes.
+DATA = load_data()
+_dirty = False
+# serializes handler mutations of DATA so two updates for the same user that
+# interleave across awaits can't clobber each other's changes
+_LOCK = asyncio.Lock()
+
+def mark_dirty():
+    global _dirty
+    _dirty = True
+
+async def flusher():
+    """Debounced background flush of DATA to disk whenever it was mutated."""
+    global _dirty
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+        if _dirty:
+            _dirty = False
+            # serialize+write in a worker thread so the event loop (and
+            # Telegram polling) never stalls on disk IO
+            await asyncio.to_thread(save_data, DATA)
+
+# DB keys are stringified Telegram user ids; cache the int -> interned str
+# conversion so handlers don't re-format the same id on every update
+_SID = {}  # int user id -> interned str key
+
+def sid(user_id: int) -> str:
+    s = _SID.get(user_id)
+    if s is None:
+        s = _SID.setdefault(user_id, sys.intern(str(user_id)))
+    return s
+
 def ensure_user(data, user_id):
     if user_id not in data:
-        data[user_id] = {"accounts": {}, "meta": {}}
+        data[user_id] = {"accounts": {}, "meta": {}, "chat_id": int(user_id)}
+        mark_dirty()
+    elif "chat_id" not in data[user_id]:
+        # users created before chat_id was stored
+        data[user_id]["chat_id"] = int(user_id)
+        mark_dirty()
     # accounts: dict username -> {last_tweet_id: str or None}
     return data[user_id]
 
+# ---------- Watch index ----------
+# DATA["_watch"] is the inverted view username -> [user_ids watching it],
+# kept up to date by add/remove so the tracker never has to re-derive it
+# by walking every user's accounts each tick.
+
+def _rebuild_watch(data):
+    watch = {}
+    for user_id, uobj in data.items():
+        if user_id.startswith("_"):
+            continue
+        for uname in uobj.get("accounts", {}):
+            watch.setdefault(uname, []).append(user_id)
+    data["_watch"] = watch
+
+def watch_add(data, username, user_id):
+    watchers = data.setdefault("_watch", {}).setdefault(username, [])
+    if user_id not in watchers:
+        watchers.append(user_id)
+        mark_dirty()
+
+def watch_discard(data, username, user_id):
+    watchers = data.get("_watch", {}).get(username)
+    if watchers and user_id in watchers:
+        watchers.remove(user_id)
+        if not watchers:
+            del data["_watch"][username]
+        mark_dirty()
+
+# migrate DB files written before the index existed
+if "_watch" not in DATA:
+    _rebuild_watch(DATA)
+
 # ---------- Scraping helper ----------
-async def fetch_latest_tweet_id_and_text(session: ClientSession, username: str) -> Optional[dict]:
+# matches hrefs like /username/status/12345 or /i/web/status/12345
+_STATUS_RE = re.compile(rb'/([A-Za-z0-9_/]+)/status/(\d+)')
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# first <item> in a Nitter RSS feed is the newest tweet
+_RSS_ITEM_RE = re.compile(rb"<item>(.*?)</item>", re.S)
+_RSS_TITLE_RE = re.compile(rb"<title>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</title>", re.S)
+
+# Validators (ETag/Last-Modified) from the last 200 response per URL.
+# Kept in memory only: they are shared across all watchers of a username and
+# are cheap to re-learn after a restart. Lets the common no-new-tweet poll be
+# a conditional GET answered with a bodyless 304.
+_cond_cache = {}  # url -> {"etag": str, "last_modified": str}
+UNCHANGED = object()  # sentinel: server said 304, nothing new since last poll
+
+async def _conditional_get(client: httpx.AsyncClient, url: str):
+    """GET with stored validators. Returns the response, or UNCHANGED on 304.
+
+    Deliberately does NOT record new validators: a 200 can be a cacheable
+    consent/anti-bot page whose ETag would wedge every later poll into 304s.
+    Callers confirm the body parsed and then call _remember_validators.
+    """
+    headers = {}
+    cached = _cond_cache.get(url)
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    resp = await client.get(url, headers=headers or None)
+    if resp.status_code == 304:
+        return UNCHANGED
+    return resp
+
+def _remember_validators(url: str, resp) -> None:
+    """Store the response's ETag/Last-Modified once its body proved usable."""
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        _cond_cache[url] = {"etag": etag, "last_modified": last_modified}
+    else:
+        _cond_cache.pop(url, None)
+
+def _extract_text_near(raw: bytes, pos: int) -> str:
+    """Best-effort tweet text preview: strip tags from a small window after the match."""
+    # pos sits inside the anchor's href attribute, so skip past the tag's
+    # closing '>' first; otherwise the attribute tail leaks into the preview
+    gt = raw.find(b">", pos)
+    if gt == -1:
+        return ""
+    window = raw[gt + 1:gt + 501]
+    try:
+        text = _TAG_RE.sub(" ", window.decode("utf-8", errors="ignore"))
+    except Exception:
+        return ""
+    return " ".join(text.split())[:280]
+
+def _parse_rss(raw: bytes) -> Optional[dict]:
+    """Pull id and title out of the newest <item> of a Nitter RSS feed."""
+    item = _RSS_ITEM_RE.search(raw)
+    if not item:
+        return None
+    m = _STATUS_RE.search(item.group(1))
+    if not m:
+        return None
+    text = ""
+    t = _RSS_TITLE_RE.search(item.group(1))
+    if t:
+        text = " ".join(t.group(1).decode("utf-8", errors="ignore").split())[:280]
+    return {"id": m.group(2).decode(), "text": text}
+
+def _parse_html(raw: bytes) -> Optional[dict]:
+    """Find the first /status/ link in an x.com profile page."""
+    # scan raw bytes with a compiled regex instead of building a full
+    # BS4 tree; skips the .text decode of the whole page too
+    m = _STATUS_RE.search(raw)
+    if not m:
+        return None
+    return {"id": m.group(2).decode(), "text": _extract_text_near(raw, m.end())}
+
+async def fetch_latest_tweet_id_and_text(client: httpx.AsyncClient, username: str):
     """
-    Return dict {'id': id_str, 'text': text} of latest tweet or None if not found.
-    This scrapes https://x.com/<username> and finds first /status/ link.
+    Return dict {'id': id_str, 'text': text} of latest tweet, UNCHANGED if the
+    server answered 304 Not Modified, or None if not found.
+    Prefers the Nitter RSS feed (a few KB of XML); falls back to scraping the
+    https://x.com/<username> HTML page when the mirror is unavailable.
     """
+    rss_url = f"{NITTER_BASE}/{username}/rss"
+    try:
+        resp = await _conditional_get(client, rss_url)
+        if resp is UNCHANGED:
+            return UNCHANGED
+        if resp.status_code == 200:
+            info = _parse_rss(resp.content)
+            if info:
+                _remember_validators(rss_url, resp)
+                return info
+        # bad status or unparseable body: never trust its validators
+        _cond_cache.pop(rss_url, None)
+        logger.warning("RSS fetch for %s returned status %s, falling back to HTML",
+                       username, resp.status_code)
+    except Exception:
+        logger.warning("RSS fetch failed for %s, falling back to HTML", username)
+
     url = f"https://x.com/{username}"
-    headers = {"User-Agent": USER_AGENT}
     try:
-        async with session.get(url, headers=headers, timeout=ClientTimeout(total=15)) as resp:
-            if resp.status != 200:
-                logger.warning("Fetch %s returned status %s", url, resp.status)
-                return None
-            html = await resp.text()
-            soup = BeautifulSoup(html, "html.parser")
-
-            # find first anchor href that contains '/status/'
-            a = soup.find("a", href=lambda h: h and "/status/" in h)
-            if not a:
-                # Try look for "data-testid=tweet" blocks and parse id attribute inside - fallback
-                # but minimal reliable approach is the /status/ link
-                return None
-
-            href = a.get("href", "")
-            # href may be like /username/status/12345 or /i/web/status/12345
-            if "/status/" in href:
-                tweet_id = href.split("/status/")[-1].split("?")[0].strip("/")
-            else:
-                return None
-
-            # attempt to extract tweet text (first nearby text)
-            text = a.get_text(strip=True)
-            if not text:
-                # try parent elements
-                text = a.parent.get_text(strip=True) if a.parent else ""
-
-            return {"id": tweet_id, "text": text}
+        resp = await _conditional_get(client, url)
+        if resp is UNCHANGED:
+            return UNCHANGED
+        if resp.status_code != 200:
+            logger.warning("Fetch %s returned status %s", url, resp.status_code)
+            return None
+        info = _parse_html(resp.content)
+        if info:
+            _remember_validators(url, resp)
+        else:
+            _cond_cache.pop(url, None)
+        return info
     except Exception as e:
         logger.exception("Error fetching latest tweet for %s: %s", username, e)
         return None
 
+# ---------- Seen-tweet dedupe ----------
+# Timelines can reorder and resurface old tweets, so comparing against a single
+# last_tweet_id is not enough to prevent duplicate notifications. Each
+# (user, username) pair keeps a small Bloom filter of recently notified ids:
+# ~2KB flat per account no matter how long the bot runs.
+_BLOOM_CAPACITY = 1024
+_BLOOM_ERROR_RATE = 0.001
+_bloom_cache = {}  # (user_id, username) -> live BloomFilter; DATA stores base64
+
+def _get_seen_filter(user_id, username, acc_info):
+    key = (user_id, username)
+    bf = _bloom_cache.get(key)
+    if bf is None:
+        encoded = acc_info.get("seen_bf")
+        if encoded:
+            try:
+                bf = BloomFilter.fromfile(BytesIO(base64.b64decode(encoded)))
+            except Exception:
+                logger.exception("Corrupt seen_bf for %s/%s, starting fresh", user_id, username)
+                bf = None
+        if bf is None:
+            bf = BloomFilter(capacity=_BLOOM_CAPACITY, error_rate=_BLOOM_ERROR_RATE)
+        _bloom_cache[key] = bf
+    return bf
+
+def _mark_seen(user_id, username, bf, tweet_id) -> "BloomFilter":
+    try:
+        bf.add(tweet_id)
+    except IndexError:
+        # filter reached capacity after ~1024 tweets; start a fresh one
+        bf = BloomFilter(capacity=_BLOOM_CAPACITY, error_rate=_BLOOM_ERROR_RATE)
+        bf.add(tweet_id)
+        _bloom_cache[(user_id, username)] = bf
+    return bf
+
+def _encode_seen_filter(bf) -> str:
+    buf = BytesIO()
+    bf.tofile(buf)
+    return base64.b64encode(buf.getvalue()).decode()
+
 # ---------- Background tracker ----------
-async def tracker_loop(app):
+async def _bounded_fetch(sem: asyncio.Semaphore, client: httpx.AsyncClient, username: str):
+    async with sem:
+        return username, await fetch_latest_tweet_id_and_text(client, username)
+
+async def _notify_user(app, chat_id: int, msgs: list):
+    """Send all of one user's pending notifications as a single message."""
+    try:
+        await app.bot.send_message(chat_id=chat_id, text="\n\n".join(msgs))
+        logger.info("Notified %s about %d new tweet(s)", chat_id, len(msgs))
+    except Exception:
+        logger.exception("Failed to send notification to %s", chat_id)
+
+# Per-username polling schedule, in memory. Accounts that tweet often are
+# polled near POLL_INTERVAL_SECONDS; quiet ones back off exponentially up to
+# POLL_INTERVAL_MAX_SECONDS, so the request budget concentrates where tweets
+# actually appear.
+_sched = {}  # username -> {"interval": float, "last_tweet_at": float}
+_poll_heap = []  # (next_poll_time, username); stale entries skipped lazily
+
+def _clamp_interval(seconds: float) -> float:
+    return max(POLL_INTERVAL_SECONDS, min(seconds, POLL_INTERVAL_MAX_SECONDS))
+
+def _reschedule(username: str, now: float, saw_new_tweet: bool):
+    """Update the username's interval estimate and push its next poll time."""
+    st = _sched[username]
+    if saw_new_tweet:
+        last_at = st.get("last_tweet_at")
+        if last_at is not None:
+            gap = now - last_at
+            st["interval"] = _clamp_interval(
+                POLL_EWMA_ALPHA * gap + (1 - POLL_EWMA_ALPHA) * st["interval"]
+            )
+        st["last_tweet_at"] = now
+    else:
+        # nothing new: back off gradually toward the cap
+        st["interval"] = _clamp_interval(st["interval"] * 1.25)
+    heapq.heappush(_poll_heap, (now + st["interval"], username))
+
+def _next_poll_delay(now: float) -> float:
+    """Seconds until the earliest scheduled poll, bounded to [1, POLL_INTERVAL_SECONDS]."""
+    if not _poll_heap:
+        return float(POLL_INTERVAL_SECONDS)
+    return min(max(_poll_heap[0][0] - now, 1.0), float(POLL_INTERVAL_SECONDS))
+
+async def tracker_loop(app, client: httpx.AsyncClient):
     """
     Background task that periodically checks latest tweets for all tracked usernames
     across all users and notifies the respective Telegram chat when a new tweet is found.
+
+    The httpx client is created once in start_bot and reused for the life of the
+    process so connections are kept alive between polls.
     """
-    logger.info("Tracker started with interval %s seconds", POLL_INTERVAL_SECONDS)
-    # use a single shared aiohttp session
-    timeout = ClientTimeout(total=20)
-    async with ClientSession(timeout=timeout) as session:
-        while True:
-            try:
-                data = load_data()
-                # Build a map username -> list of user_ids (chats) that track it
-                watch_map = {}  # username -> list of (user_id)
-                for user_id, uobj in data.items():
-                    accounts = uobj.get("accounts", {})
-                    for uname, info in accounts.items():
-                        watch_map.setdefault(uname, []).append(user_id)
-
-                if not watch_map:
-                    # nothing to track
-                    await asyncio.sleep(POLL_INTERVAL_SECONDS)
-                    continue
-
-                # iterate through usernames
-                for username, users_watching in watch_map.items():
-                    info = await fetch_latest_tweet_id_and_text(session, username)
-                    if not info or "id" not in info:
-                        # nothing found or fetch error
+    logger.info("Tracker started (poll interval %s-%ss, adaptive)",
+                POLL_INTERVAL_SECONDS, POLL_INTERVAL_MAX_SECONDS)
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+    while True:
+        try:
+            data = DATA
+            # maintained incrementally by add/remove; username -> [user_ids]
+            watch_map = data.get("_watch", {})
+
+            if not watch_map:
+                # nothing to track
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+                continue
+
+            now = time.monotonic()
+
+            # newly added usernames get polled right away
+            for username in watch_map:
+                if username not in _sched:
+                    _sched[username] = {"interval": float(POLL_INTERVAL_SECONDS)}
+                    heapq.heappush(_poll_heap, (now, username))
+
+            # pop every username whose poll time has arrived, skipping heap
+            # entries for accounts that were removed in the meantime
+            due = []
+            while _poll_heap and _poll_heap[0][0] <= now:
+                _, username = heapq.heappop(_poll_heap)
+                if username in watch_map and username not in due:
+                    due.append(username)
+            for username in list(_sched):
+                if username not in watch_map:
+                    del _sched[username]
+
+            if not due:
+                await asyncio.sleep(_next_poll_delay(now))
+                continue
+
+            # snapshot the watcher lists before the first await: watch_map is
+            # the live DATA["_watch"] dict and handlers may add/remove entries
+            # while the fetches are in flight
+            due_watchers = {u: list(watch_map[u]) for u in due}
+
+            # fetch all due usernames concurrently; the semaphore caps
+            # in-flight requests so we don't hammer the server or exhaust
+            # DNS/sockets
+            tasks = [
+                asyncio.create_task(_bounded_fetch(sem, client, u))
+                for u in due
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            # collect all new-tweet messages per chat so each user gets one
+            # Telegram round-trip per tick, however many accounts fired
+            notify = defaultdict(list)  # chat_id -> list of message texts
+            for username, result in zip(due, results):
+                # every due username must end up back on the heap, whatever
+                # happens while handling its result: a popped-but-never-
+                # rescheduled entry would stop that account being polled
+                saw_new = False
+                try:
+                    if isinstance(result, BaseException):
+                        logger.error("Fetch task for %s failed: %s", username, result)
+                        continue
+                    _, info = result
+                    users_watching = due_watchers.get(username)
+                    if not users_watching:
+                        # last watcher removed while the fetch was in flight
+                        continue
+                    if info is UNCHANGED or not info or "id" not in info:
+                        # 304, nothing found, or fetch error
                         continue
                     latest_id = info["id"]
+                    st = _sched[username]
+                    saw_new = latest_id != st.get("last_id")
+                    st["last_id"] = latest_id
                     latest_text = info.get("text", "")
 
                     # For each user watching this username, compare with stored last id
                     for user_id in users_watching:
-                        # ensure user entry exists
-                        if user_id not in data:
-                            data[user_id] = {"accounts": {}, "meta": {}}
-                        user_accounts = data[user_id].setdefault("accounts", {})
-                        acc_info = user_accounts.get(username, {})
+                        uobj = ensure_user(data, user_id)
+                        user_accounts = uobj.setdefault("accounts", {})
+                        acc_info = user_accounts.get(username)
+                        if acc_info is None:
+                            # user removed this account while the fetch was in flight
+                            continue
                         last_id = acc_info.get("last_tweet_id")
 
                         if last_id != latest_id:
-                            # New tweet — send notification
-                            try:
-                                chat_id = int(user_id)
-                                link = f"https://x.com/{username}/status/{latest_id}"
-                                text_msg = f"🟦 New Tweet by @{username}:\n\n{latest_text or link}\n\n{link}"
-                                await app.bot.send_message(chat_id=chat_id, text=text_msg)
-                                logger.info("Notified %s about new tweet %s by %s", user_id, latest_id, username)
-                            except Exception:
-                                logger.exception("Failed to send notification to %s for %s", user_id, username)
-                            # update stored last id
-                            user_accounts[username] = {"last_tweet_id": latest_id}
-                            save_data(data)
-                # done checking all
-            except Exception:
-                logger.exception("Tracker loop exception")
-            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+                            bf = _get_seen_filter(user_id, username, acc_info)
+                            if latest_id in bf:
+                                # timeline reordering resurfaced an old tweet
+                                continue
+                            bf = _mark_seen(user_id, username, bf, latest_id)
+
+                            # New tweet — queue notification
+                            link = f"https://x.com/{username}/status/{latest_id}"
+                            notify[uobj["chat_id"]].append(
+                                f"🟦 New Tweet by @{username}:\n\n{latest_text or link}\n\n{link}"
+                            )
+                            # update stored last id + seen filter
+                            acc_info["last_tweet_id"] = latest_id
+                            acc_info["seen_bf"] = _encode_seen_filter(bf)
+                            mark_dirty()
+                except Exception:
+                    logger.exception("Error handling fetch result for %s", username)
+                finally:
+                    if username in _sched:
+                        _reschedule(username, now, saw_new)
+
+            if notify:
+                await asyncio.gather(
+                    *[_notify_user(app, chat_id, msgs) for chat_id, msgs in notify.items()]
+                )
+            # done checking all
+        except Exception:
+            logger.exception("Tracker loop exception")
+        await asyncio.sleep(_next_poll_delay(time.monotonic()))
 
 # ---------- Bot Handlers ----------
+_WELCOME = (
+    "👋 Welcome!\n\n"
+    "Commands:\n"
+    "/add - Add X account\n"
+    "/remove - Remove account\n"
+    "/list - Show accounts\n"
+    "/stats - Bot usage stats\n\n"
+    "How to add: send /add then type username without @\n"
+    "Tracker will auto-check newest tweets and notify you."
+)
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
-    data = load_data()
-    ensure_user(data, str(user.id))
-    save_data(data)
-    await update.message.reply_text(
-        "👋 Welcome!\n\n"
-        "Commands:\n"
-        "/add - Add X account\n"
-        "/remove - Remove account\n"
-        "/list - Show accounts\n"
-        "/stats - Bot usage stats\n\n"
-        "How to add: send /add then type username without @\n"
-        "Tracker will auto-check newest tweets and notify you."
-    )
+    async with _LOCK:
+        ensure_user(DATA, sid(user.id))
+    await update.message.reply_text(_WELCOME)
 
 async def add(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = str(update.effective_user.id)
-    data = load_data()
-    user_obj = ensure_user(data, user_id)
-    save_data(data)
+    user_id = sid(update.effective_user.id)
+    async with _LOCK:
+        user_obj = ensure_user(DATA, user_id)
 
     if len(user_obj.get("accounts", {})) >= MAX_ACCOUNTS:
         await update.message.reply_text("❌ Max 5 accounts allowed.")
@@ -185,16 +514,15 @@ async def add(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data["adding"] = True
 
 async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = str(update.effective_user.id)
+    user_id = sid(update.effective_user.id)
     text = update.message.text.strip()
-    data = load_data()
-    user_obj = ensure_user(data, user_id)
+    async with _LOCK:
+        user_obj = ensure_user(DATA, user_id)
 
     if context.user_data.get("adding"):
         if len(user_obj.get("accounts", {})) >= MAX_ACCOUNTS:
             await update.message.reply_text("❌ Limit reached!")
             context.user_data["adding"] = False
-            save_data(data)
             return
 
         username = text.replace("@", "").strip()
@@ -209,17 +537,19 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
 
         # add with last_tweet_id = None so tracker will fetch but not notify immediately
-        user_obj.setdefault("accounts", {})[username] = {"last_tweet_id": None}
-        save_data(data)
+        async with _LOCK:
+            user_obj.setdefault("accounts", {})[username] = {"last_tweet_id": None}
+            watch_add(DATA, username, user_id)
+            mark_dirty()
         context.user_data["adding"] = False
         await update.message.reply_text(f"✅ Added: {username}\nTracker will pick up the latest tweet shortly.")
         return
 
 async def remove(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = str(update.effective_user.id)
-    data = load_data()
-    user_obj = ensure_user(data, user_id)
-    accounts = list(user_obj.get("accounts", {}).keys())
+    user_id = sid(update.effective_user.id)
+    async with _LOCK:
+        user_obj = ensure_user(DATA, user_id)
+    accounts = user_obj.get("accounts", {})
 
     if not accounts:
         await update.message.reply_text("No accounts added.")
@@ -232,9 +562,9 @@ async def remove(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def callback_remove(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
-    user_id = str(query.from_user.id)
-    data = load_data()
-    user_obj = ensure_user(data, user_id)
+    user_id = sid(query.from_user.id)
+    async with _LOCK:
+        user_obj = ensure_user(DATA, user_id)
 
     if query.data == "CLOSE":
         try:
@@ -244,18 +574,23 @@ async def callback_remove(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     acc = query.data.replace("rem_", "")
-    if acc in user_obj.get("accounts", {}):
-        user_obj["accounts"].pop(acc, None)
-        save_data(data)
+    async with _LOCK:
+        removed = acc in user_obj.get("accounts", {})
+        if removed:
+            user_obj["accounts"].pop(acc, None)
+            watch_discard(DATA, acc, user_id)
+            _bloom_cache.pop((user_id, acc), None)
+            mark_dirty()
+    if removed:
         await query.edit_message_text(f"🗑 Removed: {acc}")
     else:
         await query.edit_message_text("Account not found or already removed.")
 
 async def list_accounts(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = str(update.effective_user.id)
-    data = load_data()
-    user_obj = ensure_user(data, user_id)
-    accs = list(user_obj.get("accounts", {}).keys())
+    user_id = sid(update.effective_user.id)
+    async with _LOCK:
+        user_obj = ensure_user(DATA, user_id)
+    accs = user_obj.get("accounts", {})
 
     if not accs:
         await update.message.reply_text("No accounts added.")
@@ -265,9 +600,10 @@ async def list_accounts(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(msg)
 
 async def stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    data = load_data()
-    total_users = len(data)
-    total_accounts = sum(len(v.get("accounts", {})) for v in data.values())
+    data = DATA
+    users = [v for k, v in data.items() if not k.startswith("_")]
+    total_users = len(users)
+    total_accounts = sum(len(v.get("accounts", {})) for v in users)
     msg = f"📊 Bot Stats\nTotal users: {total_users}\nTotal accounts: {total_accounts}"
     await update.message.reply_text(msg)
 
@@ -291,17 +627,32 @@ else:
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
     app.add_error_handler(error_handler)
 
-# --- replace your current __main__ / startup with this block ---
-import asyncio
-import signal
-
+# ---------- Startup / shutdown ----------
 async def start_bot():
     await app.initialize()
     await app.start()
     logger.info("Bot started. Listening for updates.")
 
-    # start tracker AFTER app is running
-    app.create_task(tracker_loop(app))
+    # one client for the whole process: HTTP/2 multiplexes all concurrent
+    # fetches over a single TLS connection, and keepalive (75s, the common
+    # nginx default) keeps it warm between polls
+    client = httpx.AsyncClient(
+        http2=True,
+        # brotli shrinks the ~500KB profile HTML 5-10x on the wire; httpx
+        # decompresses transparently before the regex scan sees the bytes
+        headers={"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, br"},
+        timeout=20,
+        limits=httpx.Limits(
+            max_connections=50,
+            max_keepalive_connections=20,
+            keepalive_expiry=75,
+        ),
+        follow_redirects=True,
+    )
+
+    # start tracker and DB flusher AFTER app is running
+    app.create_task(tracker_loop(app, client))
+    app.create_task(flusher())
 
     # start polling
     await app.updater.start_polling()
@@ -324,6 +675,9 @@ async def start_bot():
 
     # graceful shutdown
     logger.info("Shutdown signal received. Stopping app...")
+    if _dirty:
+        save_data(DATA)
+    await client.aclose()
     await app.updater.stop_polling()
     await app.stop()
     await app.shutdown()